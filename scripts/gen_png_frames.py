@@ -1,17 +1,28 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import bisect
+import concurrent.futures
 import csv
+import functools
+import hashlib
+import io
+import json
+import os
 import re
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, NamedTuple, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
-import yaml
-
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from YAML file."""
+    import yaml  # deferred: only main() needs it, keeps --help fast
+    try:
+        # libyaml-backed parser when PyYAML was built with the C bindings
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
     with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=loader)
     return config
 
 def get_color(config: Dict[str, Any], color_name: str) -> Tuple[int, int, int]:
@@ -43,115 +54,270 @@ def has_field_config(config: Dict[str, Any], field_name: str) -> bool:
     fields = config.get('fields', {})
     return field_name in layout and field_name in fields
 
-def load_font(font_path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont:
-    return ImageFont.truetype(font_path, size=size, index=index)
+def cell(row: dict, key: str) -> str:
+    """Fetch a CSV cell as a stripped string ('' when missing)."""
+    return (row.get(key) or "").strip()
+
+class FieldSpec(NamedTuple):
+    """Per-field styling resolved from config once, instead of per row."""
+    box: Tuple[int, int, int, int]
+    color: Tuple[int, int, int]
+    align: str
+    line_spacing: int
+    font_size: int
+    min_size: Optional[int]
+
+def resolve_fields(config: Dict[str, Any]) -> Dict[str, FieldSpec]:
+    """Flatten the nested config into a FieldSpec per configured field.
+
+    The config is static across rows; resolving it once removes the
+    repeated dict traversals from the per-row render path.
+    """
+    specs = {}
+    for field_name in config.get('fields', {}):
+        if not has_field_config(config, field_name):
+            continue
+        field_config = get_field_config(config, field_name)
+        font_config = field_config.get('font', {})
+        min_size = font_config.get('min_size')
+        specs[field_name] = FieldSpec(
+            box=get_box(config, field_name),
+            color=get_color(config, field_config.get('color', 'header')),
+            align=field_config.get('align', 'left'),
+            line_spacing=field_config.get('line_spacing', 10),
+            font_size=font_config.get('size', 72 if min_size is not None else 40),
+            min_size=min_size,
+        )
+    return specs
+
+@functools.lru_cache(maxsize=4)
+def _base_font(font_path: str, index: int) -> ImageFont.FreeTypeFont:
+    """Read the font file once; sized variants are derived from the in-memory bytes.
+
+    The basic layout engine skips Raqm/HarfBuzz shaping, which CJK +
+    plain Latin text doesn't need and which costs real time per call.
+    """
+    with open(font_path, "rb") as f:
+        data = f.read()
+    return ImageFont.truetype(io.BytesIO(data), size=16, index=index,
+                              layout_engine=ImageFont.Layout.BASIC)
 
+@functools.lru_cache(maxsize=256)
+def load_font(font_path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont:
+    """Load a font, caching each (path, size, index) so each size is built once per process."""
+    return _base_font(font_path, index).font_variant(size=size)
+
+# Cached (ascent, descent) per font instance; metrics are constant for a given font.
+_METRICS_CACHE: Dict[int, Tuple[int, int]] = {}
+
+# Per-font token -> advance width cache. CJK text reuses the same short tokens
+# constantly across rows, so hit rates are high.
+_TOKEN_W_CACHE: Dict[int, Dict[str, float]] = {}
+
+def _is_cjk(ch: str) -> bool:
+    return '\u4e00' <= ch <= '\u9fff'
+
+def token_width(font: ImageFont.FreeTypeFont, t: str) -> float:
+    """Return the cached horizontal advance of `t` for `font`.
+
+    CJK runs are summed from per-character advances (Han glyphs have no
+    kerning), so an unseen CJK token is usually a pure table lookup.
+    Other tokens fall back to font.getlength to preserve kerning.
+    """
+    cache = _TOKEN_W_CACHE.setdefault(id(font), {})
+    w = cache.get(t)
+    if w is None:
+        if len(t) > 1 and all(_is_cjk(ch) for ch in t):
+            w = 0.0
+            for ch in t:
+                ch_w = cache.get(ch)
+                if ch_w is None:
+                    ch_w = cache[ch] = font.getlength(ch)
+                w += ch_w
+        else:
+            w = font.getlength(t)
+        cache[t] = w
+    return w
+
+def font_metrics(font: ImageFont.FreeTypeFont) -> Tuple[int, int]:
+    """Return cached (ascent, descent) for a font."""
+    key = id(font)
+    metrics = _METRICS_CACHE.get(key)
+    if metrics is None:
+        metrics = _METRICS_CACHE[key] = font.getmetrics()
+    return metrics
+
+# Solid-color backgrounds: "#0a1a40" style hex instead of an image path
+_HEX_COLOR_RE = re.compile(r"#[0-9a-fA-F]{6}")
+
+@functools.lru_cache(maxsize=4)
+def load_background(bg_path: str, width: int, height: int) -> Image.Image:
+    """Decode and resize the background once per process; callers must not draw on the template.
+
+    A `#rrggbb` value builds a solid-color canvas directly, skipping the
+    decode and resample entirely.
+    """
+    if _HEX_COLOR_RE.fullmatch(bg_path):
+        return Image.new("RGB", (width, height), bg_path)
+    # Bilinear is plenty for a paper-texture background and much cheaper than
+    # the higher-order filters.
+    return Image.open(bg_path).convert("RGB").resize((width, height), Image.Resampling.BILINEAR)
+
+# One pass over the whole string: newline, space, Chinese run, English
+# word/digit run, or punctuation run. Other whitespace (tabs etc.) is dropped,
+# matching the old nested split behaviour.
+_TOKEN_RE = re.compile(r"\n| |[\u4e00-\u9fff]+|[A-Za-z0-9]+|[^\s\u4e00-\u9fffA-Za-z0-9]+")
+
+# Reusable per-process frame buffer; frame_canvas hands out the same image
+# each call, so a frame must be saved before the next row is rendered.
+_SCRATCH: Dict[Tuple[int, int], Image.Image] = {}
+
+def frame_canvas(bg_path: str, width: int, height: int) -> Image.Image:
+    """Return a scratch canvas pre-filled with the background.
+
+    Reuses one buffer per canvas size instead of allocating a fresh
+    ~11 MB image per row; the background template is blitted over it
+    with a single paste.
+    """
+    scratch = _SCRATCH.get((width, height))
+    if scratch is None:
+        scratch = _SCRATCH[(width, height)] = Image.new("RGB", (width, height))
+    scratch.paste(load_background(bg_path, width, height), (0, 0))
+    return scratch
+
+@functools.lru_cache(maxsize=1024)
 def tokenize_mixed_text(s: str):
-    """Tokenize text while preserving spaces and word boundaries."""
+    """Tokenize text while preserving spaces and word boundaries.
+
+    Cached: the same strings recur across rows (weekdays, months, footer),
+    and fit_text_in_box re-tokenizes per call.
+    """
     s = (s or "").replace("\r\n", "\n").replace("\r", "\n")
-    tokens = []
-    for para in s.split("\n"):
-        if para == "":
-            tokens.append("\n")
-            continue
-        # Split by whitespace but keep the spaces
-        # This regex matches: Chinese chars, English words, punctuation, or spaces
-        # We'll use a simpler approach: split by spaces and add them back
-        words = para.split(" ")
-        for i, word in enumerate(words):
-            if word:
-                # Split word into Chinese chars, English words, and punctuation
-                word_parts = re.findall(r"[\u4e00-\u9fff]+|[A-Za-z0-9]+|[^\sA-Za-z0-9\u4e00-\u9fff]+", word)
-                tokens.extend(word_parts)
-            # Add space after each word except the last one in the paragraph
-            if i < len(words) - 1:
-                tokens.append(" ")
-        tokens.append("\n")
-    if tokens:
-        tokens.pop()  # Remove trailing newline
-    return tokens
-
-def wrap_tokens_to_width(draw: ImageDraw.ImageDraw, tokens, font, max_width: int):
-    """Wrap tokens to fit width while preserving spaces."""
-    lines, cur = [], ""
-
-    def text_w(t: str) -> int:
-        if not t:
-            return 0
-        b = draw.textbbox((0, 0), t, font=font)
-        return b[2] - b[0]
-
-    for tok in tokens:
+    return tuple(_TOKEN_RE.findall(s))
+
+def wrap_tokens_to_width(tokens, font, max_width: int):
+    """Wrap tokens to fit width while preserving spaces.
+
+    Measures all token advances up front into a tape (cached per font),
+    then finds each break point with a bisect over the prefix sums —
+    one C-level search per line instead of a Python step per token.
+    """
+    n = len(tokens)
+    pre = [0.0] * (n + 1)
+    for k, tok in enumerate(tokens):
+        pre[k + 1] = pre[k] + (0.0 if tok == "\n" else token_width(font, tok))
+
+    lines = []
+    cur_parts: list = []   # accumulated line, possibly tail of a hard-broken token
+    cur_w = 0.0
+    seg_end = -1           # index of the newline bounding the current segment
+
+    def flush():
+        nonlocal cur_w
+        line = "".join(cur_parts).rstrip()
+        if line:  # Only add non-empty lines
+            lines.append(line)
+        cur_parts.clear()
+        cur_w = 0.0
+
+    i = 0
+    while i < n:
+        tok = tokens[i]
         if tok == "\n":
-            if cur.strip():  # Only add non-empty lines
-                lines.append(cur.rstrip())
-            cur = ""
+            flush()
+            i += 1
             continue
 
-        # Try adding the token to current line
-        cand = cur + tok if cur else tok
-        
-        # If it fits, add it
-        if text_w(cand) <= max_width:
-            cur = cand
+        if i > seg_end:
+            try:
+                seg_end = tokens.index("\n", i)
+            except ValueError:
+                seg_end = n
+
+        # Largest j such that tokens[i:j] still fits the remaining budget
+        j = bisect.bisect_right(pre, pre[i] + (max_width - cur_w), i, seg_end + 1) - 1
+        if j > i:
+            cur_parts.extend(tokens[i:j])
+            cur_w += pre[j] - pre[i]
+            i = j
             continue
 
-        # Doesn't fit - need to wrap
-        if cur.strip():  # If current line has content, save it
-            lines.append(cur.rstrip())
-            cur = ""
-        
-        # Handle the token that doesn't fit
-        if tok == " ":  # If it's just a space, skip it
+        # tokens[i] doesn't fit on the current line
+        if cur_parts:
+            flush()
+            if tok == " ":  # If it's just a space, skip it
+                i += 1
+            continue  # retry with a full budget
+
+        if tok == " ":  # A space wider than the box: skip it
+            i += 1
             continue
-        
-        # Check if token itself is too long (hard break)
-        if text_w(tok) > max_width:
-            # Break long token character by character
-            buf = ""
-            for ch in tok:
-                c2 = buf + ch
-                if text_w(c2) <= max_width:
-                    buf = c2
-                else:
-                    if buf:
-                        lines.append(buf)
-                    buf = ch
-            cur = buf
-        else:
-            # Token fits on its own, start new line
-            cur = tok
 
-    # Add remaining content
-    if cur.strip():
-        lines.append(cur.rstrip())
+        # Token alone is too long: break it character by character
+        buf_w = 0.0
+        for ch in tok:
+            ch_w = token_width(font, ch)
+            if buf_w + ch_w <= max_width:
+                cur_parts.append(ch)
+                buf_w += ch_w
+            else:
+                if cur_parts:
+                    lines.append("".join(cur_parts))
+                    cur_parts.clear()
+                cur_parts.append(ch)
+                buf_w = ch_w
+        cur_w = buf_w
+        i += 1
 
-    # Remove empty lines
-    lines = [line for line in lines if line.strip()]
+    # Add remaining content
+    flush()
 
     return lines
 
-def fit_text_in_box(draw, text: str, font_path: str, font_index: int,
+def fit_text_in_box(text: str, font_path: str, font_index: int,
                     box_w: int, box_h: int,
                     start_size: int, min_size: int,
                     line_spacing: int):
+    """Pure measurement: sizes and wraps text via font metrics only, no draw context."""
+    # Fast path: a short single-line string that fits at start_size needs no
+    # tokenizing or size search (headers, short horoscopes).
+    font = load_font(font_path, size=start_size, index=font_index)
+    if "\n" not in text:
+        ascent, descent = font_metrics(font)
+        if (font.getlength(text) <= box_w
+                and ascent + descent + line_spacing <= box_h):
+            return font, [text]
+
     tokens = tokenize_mixed_text(text)
 
-    for size in range(start_size, min_size - 1, -2):
+    def measure(size):
         font = load_font(font_path, size=size, index=font_index)
-        lines = wrap_tokens_to_width(draw, tokens, font, box_w)
-
-        ascent, descent = font.getmetrics()
+        lines = wrap_tokens_to_width(tokens, font, box_w)
+        ascent, descent = font_metrics(font)
         line_h = ascent + descent + line_spacing
-        total_h = len(lines) * line_h
+        return font, lines, len(lines) * line_h
+
+    # Wrapped height is monotone in font size, so binary-search the size
+    # candidates (descending, step 2) instead of walking them linearly.
+    sizes = range(start_size, min_size - 1, -2)
+    best = None
+    lo, hi = 0, len(sizes) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        font, lines, total_h = measure(sizes[mid])
         if total_h <= box_h:
-            return font, lines
+            best = (font, lines)
+            hi = mid - 1  # fits; try a larger size
+        else:
+            lo = mid + 1
+    if best is not None:
+        return best
 
     # truncate at min size
     font = load_font(font_path, size=min_size, index=font_index)
-    lines = wrap_tokens_to_width(draw, tokens, font, box_w)
+    lines = wrap_tokens_to_width(tokens, font, box_w)
 
-    ascent, descent = font.getmetrics()
+    ascent, descent = font_metrics(font)
     line_h = ascent + descent + line_spacing
     max_lines = max(1, box_h // line_h)
     truncated = len(lines) > max_lines
@@ -159,20 +325,23 @@ def fit_text_in_box(draw, text: str, font_path: str, font_index: int,
 
     if truncated and lines:
         last = lines[-1]
-        ell = "…"
-        while True:
-            b = draw.textbbox((0, 0), last + ell, font=font)
-            if (b[2] - b[0]) <= box_w or last == "":
-                break
-            last = last[:-1]
+        ell = "…"  # single U+2026 ellipsis glyph
+        # Binary-search the longest prefix that still fits with the ellipsis
+        lo, hi = 0, len(last)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if font.getlength(last[:mid] + ell) <= box_w:
+                lo = mid
+            else:
+                hi = mid - 1
+        last = last[:lo]
         lines[-1] = (last + ell) if last else ell
 
     return font, lines
 
-def draw_lines(img, box, lines, font, fill, align="left", line_spacing=10):
+def draw_lines(draw, box, lines, font, fill, align="left", line_spacing=10):
     x, y, w, h = box
-    draw = ImageDraw.Draw(img)
-    ascent, descent = font.getmetrics()
+    ascent, descent = font_metrics(font)
     line_h = ascent + descent + line_spacing
 
     # Calculate total height of all lines
@@ -185,39 +354,53 @@ def draw_lines(img, box, lines, font, fill, align="left", line_spacing=10):
         yy = y
 
     for line in lines:
-        if not line.strip():  # Skip empty lines
-            continue
         # Ensure yy is within box bounds
         if yy < y:
             yy = y
         if yy + line_h > y + h:
             break
         if align == "right":
-            b = draw.textbbox((0, 0), line, font=font)
-            tw = b[2] - b[0]
+            tw = int(font.getlength(line))
             xx = max(x, x + w - tw)  # Ensure xx >= x
         elif align == "center":
-            b = draw.textbbox((0, 0), line, font=font)
-            tw = b[2] - b[0]
+            tw = int(font.getlength(line))
             xx = x + max(0, (w - tw) // 2)  # Ensure xx >= x
         else:
             xx = x
         draw.text((xx, yy), line, font=font, fill=fill)
         yy += line_h
 
-def render_field(draw, bg, row: dict, csv_field_name: str, config: Dict[str, Any], 
-                 font_path: str, font_index: int) -> None:
-    """Render a single field based on CSV column name and configuration."""
+# Pre-rendered RGBA tiles for fixed-size fields. Months, weekdays, the year and
+# the footer only have a handful of distinct values across the whole batch, so
+# each is rasterized through FreeType once and pasted thereafter.
+_TILE_CACHE: Dict[tuple, Image.Image] = {}
+
+def header_tile(text: str, font, fill, align: str, line_spacing: int,
+                w: int, h: int) -> Image.Image:
+    """Return a cached transparent tile with `text` drawn box-aligned."""
+    key = (text, id(font), fill, align, line_spacing, w, h)
+    tile = _TILE_CACHE.get(key)
+    if tile is None:
+        tile = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        draw_lines(ImageDraw.Draw(tile), (0, 0, w, h), [text], font, fill,
+                   align=align, line_spacing=line_spacing)
+        _TILE_CACHE[key] = tile
+    return tile
+
+def render_field(draw, bg, row: dict, csv_field_name: str, config: Dict[str, Any],
+                 specs: Dict[str, FieldSpec], font_path: str, font_index: int) -> None:
+    """Render a single field based on CSV column name and resolved spec."""
     # Get the configuration field name (may be mapped)
     config_field_name = get_field_mapping(config, csv_field_name)
-    
+
     # Check if this field has configuration
-    if not has_field_config(config, config_field_name):
+    spec = specs.get(config_field_name)
+    if spec is None:
         return
-    
+
     # Get field value from CSV row
-    field_value = (row.get(csv_field_name, "") or "").strip()
-    
+    field_value = cell(row, csv_field_name)
+
     # Special handling for date field -> year extraction
     if csv_field_name == "date" and config_field_name == "year":
         try:
@@ -228,46 +411,38 @@ def render_field(draw, bg, row: dict, csv_field_name: str, config: Dict[str, Any
                 return
         except (IndexError, ValueError):
             return
-    
+
     # Skip if field value is empty
     if not field_value:
         return
-    
-    # Get field configuration
-    field_config = get_field_config(config, config_field_name)
-    box = get_box(config, config_field_name)
-    color = get_color(config, field_config.get('color', 'header'))
-    align = field_config.get('align', 'left')
-    line_spacing = field_config.get('line_spacing', 10)
-    font_config = field_config.get('font', {})
-    
-    # Check if this field supports auto-fit (has min_size)
-    min_size = font_config.get('min_size')
-    
-    if min_size is not None:
+
+    if spec.min_size is not None:
         # Auto-fit text field (like main_text, horoscope)
-        _, _, w, h = box
-        start_size = font_config.get('size', 72)
-        
+        _, _, w, h = spec.box
         font, lines = fit_text_in_box(
-            draw, field_value, font_path=font_path, font_index=font_index,
+            field_value, font_path=font_path, font_index=font_index,
             box_w=w, box_h=h,
-            start_size=start_size, min_size=min_size,
-            line_spacing=line_spacing
+            start_size=spec.font_size, min_size=spec.min_size,
+            line_spacing=spec.line_spacing
         )
     else:
-        # Fixed size field
-        font_size = font_config.get('size', 40)
-        font = load_font(font_path, font_size, font_index)
-        
-        def as_lines(s): return [str(s or "").strip()]
-        lines = as_lines(field_value)
-    
-    # Draw the field
-    draw_lines(bg, box, lines, font, color, align=align, line_spacing=line_spacing)
+        # Fixed size field: blit a cached pre-rendered tile instead of
+        # re-shaping the same string through FreeType every frame
+        font = load_font(font_path, spec.font_size, font_index)
+        x, y, w, h = spec.box
+        tile = header_tile(field_value, font, spec.color, spec.align, spec.line_spacing, w, h)
+        bg.paste(tile, (x, y), tile)
+        return
+
+    # Draw the field (reuse the draw context created in render_one)
+    draw_lines(draw, spec.box, lines, font, spec.color,
+               align=spec.align, line_spacing=spec.line_spacing)
 
-def render_one(row: dict, csv_headers: list, bg_path: str, config: Dict[str, Any]) -> Image.Image:
+def render_one(row: dict, csv_headers: list, bg_path: str, config: Dict[str, Any],
+               specs: Optional[Dict[str, FieldSpec]] = None) -> Image.Image:
     """Render a single calendar frame based on row data and configuration."""
+    if specs is None:
+        specs = resolve_fields(config)
     # Get canvas dimensions
     canvas = config.get('canvas', {})
     W = canvas.get('width', 1440)
@@ -280,25 +455,81 @@ def render_one(row: dict, csv_headers: list, bg_path: str, config: Dict[str, Any
     
     if not font_path:
         raise ValueError("Font path must be set in config or via command line")
-    
-    bg = Image.open(bg_path).convert("RGB").resize((W, H))
+
+    bg = frame_canvas(bg_path, W, H)
     draw = ImageDraw.Draw(bg)
     
     # Render all fields dynamically based on CSV headers
     for csv_field_name in csv_headers:
-        render_field(draw, bg, row, csv_field_name, config, font_path, font_index)
+        render_field(draw, bg, row, csv_field_name, config, specs, font_path, font_index)
     
     return bg
 
+# Per-process render context, set once by init_worker so tasks carry only the
+# row dict instead of re-pickling config/specs/paths per task.
+_WORKER: Dict[str, Any] = {}
+
+def run_key(csv_headers, bg_path, config, png_level, out_format) -> str:
+    """Digest of everything besides the row that shapes a frame's pixels."""
+    h = hashlib.blake2b()
+    h.update(json.dumps([csv_headers, config, png_level, out_format],
+                        sort_keys=True).encode())
+    if Path(bg_path).is_file():
+        h.update(Path(bg_path).read_bytes())
+    else:  # solid-color background
+        h.update(bg_path.encode())
+    return h.hexdigest()
+
+def init_worker(csv_headers, bg_path, config, specs, out_dir, png_level,
+                out_format="png", key="", force=True) -> None:
+    """Set up a render process: stash shared state and warm the background cache."""
+    _WORKER.update(csv_headers=csv_headers, bg_path=bg_path, config=config,
+                   specs=specs, out_dir=out_dir, png_level=png_level,
+                   out_format=out_format, run_key=key, force=force)
+    canvas = config.get('canvas', {})
+    load_background(bg_path, canvas.get('width', 1440), canvas.get('height', 2560))
+
+def render_row(row: dict) -> str:
+    """Render one CSV row and save the frame (worker entry point for the process pool)."""
+    ctx = _WORKER
+    date = cell(row, "date")
+    name = f"{date}.{ctx['out_format']}"
+    out_path = Path(ctx['out_dir']) / name
+
+    # Incremental skip: identical inputs -> the existing frame is still right.
+    # Keys are stringified: DictReader uses a None key for overflow columns.
+    row_json = json.dumps({str(k): v for k, v in row.items()}, sort_keys=True)
+    key = hashlib.blake2b((ctx['run_key'] + row_json).encode()).hexdigest()
+    key_path = out_path.with_name(name + ".key")
+    if (not ctx['force'] and out_path.exists()
+            and key_path.exists() and key_path.read_text() == key):
+        return f"{name} (cached)"
+
+    img = render_one(row, ctx['csv_headers'], ctx['bg_path'], ctx['config'], ctx['specs'])
+    if ctx['out_format'] == "webp":
+        img.save(out_path, "WEBP", lossless=True, quality=80)
+    else:
+        img.save(out_path, "PNG", compress_level=ctx['png_level'], optimize=False)
+    key_path.write_text(key)
+    return name
+
 def main():
     import argparse
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", required=True, help="Input CSV file with calendar data")
-    ap.add_argument("--bg", required=True, help="Paper texture background png/jpg")
+    ap.add_argument("--bg", required=True, help="Paper texture background png/jpg, or a solid #rrggbb color")
     ap.add_argument("--out", required=True, help="Output frames directory")
     ap.add_argument("--config", required=True, help="YAML configuration file")
     ap.add_argument("--font", help="Font .ttf/.ttc (overrides config)")
     ap.add_argument("--font-index", type=int, help="Font index (overrides config)")
+    ap.add_argument("--png-level", type=int, default=1, choices=range(0, 10),
+                    help="PNG zlib compression level 0-9 (default 1: much faster encode, slightly larger files)")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Number of render processes (default: CPU count; 1 disables the pool)")
+    ap.add_argument("--out-format", choices=("png", "webp"), default="png",
+                    help="Frame format: png, or lossless webp (faster encode, smaller files)")
+    ap.add_argument("--force", action="store_true",
+                    help="Re-render frames even when the output and its .key sidecar are up to date")
     args = ap.parse_args()
 
     # Load configuration
@@ -322,23 +553,46 @@ def main():
     if not font_path:
         raise ValueError("Font path must be set in config file or via --font")
 
+    # Resolve per-field styling once for the whole run
+    specs = resolve_fields(config)
+
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # Cheap first pass for the progress total; rows themselves are streamed below.
     with open(args.csv, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        csv_headers = reader.fieldnames
+        reader = csv.reader(f)
+        csv_headers = next(reader, None)
         if not csv_headers:
             raise ValueError("CSV file has no headers")
-        rows = list(reader)
-
-    for i, row in enumerate(rows, 1):
-        date = (row.get("date") or "").strip()
-        if not date:
-            raise ValueError(f"Row {i} missing 'date'")
-        img = render_one(row, csv_headers, args.bg, config)
-        img.save(out_dir / f"{date}.png", "PNG")
-        print(f"[{i}/{len(rows)}] {date}.png")
+        total = sum(1 for _ in reader)
+
+    def rows():
+        with open(args.csv, "r", encoding="utf-8-sig", newline="") as f:
+            for i, row in enumerate(csv.DictReader(f), 1):
+                if not cell(row, "date"):
+                    raise ValueError(f"Row {i} missing 'date'")
+                yield row
+
+    init_args = (csv_headers, args.bg, config, specs, str(out_dir), args.png_level,
+                 args.out_format,
+                 run_key(csv_headers, args.bg, config, args.png_level, args.out_format),
+                 args.force)
+
+    workers = args.workers if args.workers is not None else os.cpu_count()
+    if workers and workers > 1 and total > 1:
+        # Each row is an independent CPU-bound render; processes scale past the
+        # GIL. Shared state (config, specs, paths) goes to each worker once via
+        # the initializer, so tasks are just row dicts.
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker, initargs=init_args) as ex:
+            for i, name in enumerate(ex.map(render_row, rows(), chunksize=8), 1):
+                print(f"[{i}/{total}] {name}")
+    else:
+        init_worker(*init_args)
+        for i, row in enumerate(rows(), 1):
+            name = render_row(row)
+            print(f"[{i}/{total}] {name}")
 
     print("Done.")
 
@@ -2,19 +2,24 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import concurrent.futures
 import csv
+import hashlib
 import os
 import re
 import subprocess
-import tempfile
 from pathlib import Path
-import openai
 
 # OpenAI TTS input max length (chars) per request
 MAX_CHARS = 4096  #  [oai_citation:2‡OpenAI Platform](https://platform.openai.com/docs/api-reference/audio/createSpeech?utm_source=chatgpt.com)
 
-def run(cmd: list[str]) -> None:
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+# Split patterns for smart_split_text, compiled once
+_PARA_RE = re.compile(r"\n{2,}")
+_SENT_RE = re.compile(r"(?<=[。！？.!?])\s*")
+
+def run(cmd: list[str], input: str | None = None) -> None:
+    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                       input=input)
     if p.returncode != 0:
         raise RuntimeError(p.stdout)
 
@@ -27,7 +32,7 @@ def smart_split_text(text: str, limit: int = MAX_CHARS):
         return [text]
 
     # split by double newlines first
-    parts = re.split(r"\n{2,}", text)
+    parts = _PARA_RE.split(text)
     chunks = []
     cur = ""
     for part in parts:
@@ -36,7 +41,7 @@ def smart_split_text(text: str, limit: int = MAX_CHARS):
             continue
         if len(part) > limit:
             # fallback: sentence split
-            sentences = re.split(r"(?<=[。！？.!?])\s*", part)
+            sentences = _SENT_RE.split(part)
             for s in sentences:
                 s = s.strip()
                 if not s:
@@ -69,6 +74,8 @@ def smart_split_text(text: str, limit: int = MAX_CHARS):
     return chunks
 
 def tts_to_file(text: str, out_path: Path, model: str, voice: str, fmt: str, speed: float, instructions: str | None):
+    import openai  # deferred: keeps --help and argparse errors fast
+
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Streaming API example is documented by OpenAI  [oai_citation:3‡OpenAI Platform](https://platform.openai.com/docs/api-reference/audio/speech-audio-delta-event?_clear=true&adobe_mc=MCMID%3D12000814905405683995335849378418609464%7CMCORGID%3DA8833BC75245AF9E0A490D4D%2540AdobeOrg%7CTS%3D1744156800&lang=python)
@@ -82,22 +89,21 @@ def tts_to_file(text: str, out_path: Path, model: str, voice: str, fmt: str, spe
 def concat_audio_ffmpeg(inputs: list[Path], out_path: Path):
     """
     Concatenate audio segments (same codec/format) using ffmpeg concat demuxer.
+
+    The concat list is piped via stdin — no temp dir, less log noise,
+    faster startup.
     """
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with tempfile.TemporaryDirectory() as td:
-        td = Path(td)
-        lst = td / "list.txt"
-        lines = [f"file '{p.as_posix()}'" for p in inputs]
-        lst.write_text("\n".join(lines), encoding="utf-8")
-
-        cmd = [
-            "ffmpeg", "-y",
-            "-f", "concat", "-safe", "0",
-            "-i", str(lst),
-            "-c", "copy",
-            str(out_path),
-        ]
-        run(cmd)
+    list_text = "\n".join(f"file '{p.as_posix()}'" for p in inputs)
+    cmd = [
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "concat", "-safe", "0",
+        "-protocol_whitelist", "pipe,file,fd",
+        "-i", "pipe:0",
+        "-c", "copy",
+        str(out_path),
+    ]
+    run(cmd, input=list_text)
 
 def gen_one(text: str, out_file: Path, model: str, voice: str, fmt: str, speed: float,
             instructions: str | None, allow_split_concat: bool):
@@ -106,6 +112,12 @@ def gen_one(text: str, out_file: Path, model: str, voice: str, fmt: str, speed:
         return
 
     chunks = smart_split_text(text, MAX_CHARS)
+    if len(chunks) == 1:
+        # Stripping/normalizing can bring long input under the limit; no
+        # reason to write a .part file and spawn ffmpeg for one segment.
+        tts_to_file(chunks[0], out_file, model, voice, fmt, speed, instructions)
+        return
+
     segs = []
     for idx, chunk in enumerate(chunks, 1):
         seg_path = out_file.parent / f"{out_file.stem}.part{idx:02d}.{fmt}"
@@ -114,6 +126,12 @@ def gen_one(text: str, out_file: Path, model: str, voice: str, fmt: str, speed:
 
     concat_audio_ffmpeg(segs, out_file)
 
+def synthesis_key(text: str, model: str, voice: str, fmt: str, speed: float,
+                  instructions: str | None) -> str:
+    """Digest of every input that shapes the synthesized audio."""
+    payload = "\x1f".join([text, model, voice, fmt, str(speed), instructions or ""])
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
 def load_text_from_args(args) -> str:
     if args.text:
         return args.text
@@ -146,6 +164,10 @@ def main():
     ap.add_argument("--text-col", default="main_text")
     ap.add_argument("--date-col", default="date")
     ap.add_argument("--audio-out-dir", default=None)
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Concurrent TTS requests in --csv mode (I/O-bound; mind your rate limits)")
+    ap.add_argument("--force", action="store_true",
+                    help="Re-synthesize even when the output and its .key sidecar are up to date")
 
     args = ap.parse_args()
 
@@ -155,21 +177,49 @@ def main():
         out_dir = Path(args.audio_out_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
 
+        # Cheap pre-pass for the progress total; rows are streamed below.
+        with open(args.csv, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            total = sum(1 for _ in reader)
+
+        jobs = []
         with open(args.csv, "r", encoding="utf-8-sig", newline="") as f:
-            rows = list(csv.DictReader(f))
-
-        for i, row in enumerate(rows, 1):
-            date = (row.get(args.date_col) or "").strip()
-            text = (row.get(args.text_col) or "").strip()
-            if not date:
-                raise ValueError(f"Row {i}: missing {args.date_col}")
-            if not text:
-                print(f"[{i}/{len(rows)}] {date}: empty text, skipped")
-                continue
-
-            out_file = out_dir / f"{date}.{args.format}"
-            print(f"[{i}/{len(rows)}] {date} -> {out_file.name}")
-            gen_one(text, out_file, args.model, args.voice, args.format, args.speed, args.instructions, args.split_concat)
+            for i, row in enumerate(csv.DictReader(f), 1):
+                date = (row.get(args.date_col) or "").strip()
+                text = (row.get(args.text_col) or "").strip()
+                if not date:
+                    raise ValueError(f"Row {i}: missing {args.date_col}")
+                if not text:
+                    print(f"[{i}/{total}] {date}: empty text, skipped")
+                    continue
+                jobs.append((i, date, text, out_dir / f"{date}.{args.format}"))
+
+        def speak(job):
+            i, date, text, out_file = job
+            key = synthesis_key(text, args.model, args.voice, args.format,
+                                args.speed, args.instructions)
+            key_file = out_file.with_name(out_file.name + ".key")
+            if (not args.force and out_file.exists()
+                    and key_file.exists() and key_file.read_text() == key):
+                return i, f"{date} (cached)", out_file
+            gen_one(text, out_file, args.model, args.voice, args.format,
+                    args.speed, args.instructions, args.split_concat)
+            key_file.write_text(key)
+            return i, date, out_file
+
+        if args.jobs > 1:
+            # Each request is a blocking HTTP call with near-zero CPU; threads
+            # overlap the network round-trips.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as ex:
+                futures = [ex.submit(speak, job) for job in jobs]
+                for fut in concurrent.futures.as_completed(futures):
+                    i, date, out_file = fut.result()
+                    print(f"[{i}/{total}] {date} -> {out_file.name}")
+        else:
+            for job in jobs:
+                i, date, out_file = speak(job)
+                print(f"[{i}/{total}] {date} -> {out_file.name}")
         print("Done.")
         return
 